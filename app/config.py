@@ -1,7 +1,8 @@
 """Application configuration management"""
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 import os
 
 
@@ -30,7 +31,7 @@ class Settings(BaseSettings):
     
     def get_allowed_extensions_list(self) -> List[str]:
         """Get allowed extensions as a list"""
-        return [ext.strip().lower() for ext in self.allowed_extensions.split(",")]
+        return list(_parse_allowed_extensions(self.allowed_extensions))
     
     # Security & Compliance
     encryption_key: str = Field(default="", env="ENCRYPTION_KEY")
@@ -46,8 +47,22 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# Create settings instance
-settings = Settings()
+@lru_cache(maxsize=32)
+def _parse_allowed_extensions(allowed_extensions: str) -> Tuple[str, ...]:
+    """Parse the comma-separated extensions string once per distinct value"""
+    return tuple(ext.strip().lower() for ext in allowed_extensions.split(","))
 
-# Ensure upload directory exists
-os.makedirs(settings.upload_dir, exist_ok=True)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the cached settings instance
+
+    get_settings.cache_clear() reloads settings for code that calls get_settings()
+    on use; values captured at import (e.g. app.main.settings) are not refreshed.
+    """
+    return Settings()
+
+
+def ensure_upload_dir() -> None:
+    """Create the upload directory if missing (called at application startup)"""
+    os.makedirs(get_settings().upload_dir, exist_ok=True)
@@ -1,7 +1,20 @@
 """FastAPI application entry point"""
-from fastapi import FastAPI
+import orjson
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import settings
+from fastapi.responses import ORJSONResponse
+from app.config import get_settings, ensure_upload_dir
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown"""
+    ensure_upload_dir()
+    yield
+
 
 # Create FastAPI application instance
 app = FastAPI(
@@ -9,6 +22,8 @@ app = FastAPI(
     description="AI-Powered Court Document Intelligence MVP",
     version="0.1.0",
     debug=settings.debug,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -21,23 +36,37 @@ app.add_middleware(
 )
 
 
-@app.get("/")
+# Static response bodies, serialized once at import. Like `settings` above they
+# are not refreshed by get_settings.cache_clear(); restart to pick up changes.
+_ROOT_PAYLOAD = {
+    "message": f"Welcome to {settings.app_name}",
+    "version": "0.1.0",
+    "status": "operational"
+}
+_ROOT_BODY = orjson.dumps(_ROOT_PAYLOAD)
+
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "environment": settings.app_env
+}
+_HEALTH_BODY = orjson.dumps(_HEALTH_PAYLOAD)
+
+
+def _static_json_docs(payload: dict) -> dict:
+    """OpenAPI responses entry documenting a precomputed JSON body"""
+    return {200: {"content": {"application/json": {"example": payload}}}}
+
+
+@app.get("/", responses=_static_json_docs(_ROOT_PAYLOAD))
 async def root():
     """Root endpoint"""
-    return {
-        "message": f"Welcome to {settings.app_name}",
-        "version": "0.1.0",
-        "status": "operational"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/health")
+@app.get("/health", responses=_static_json_docs(_HEALTH_PAYLOAD))
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "environment": settings.app_env
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # Include API routes (to be added in Phase 2)
@@ -46,10 +75,14 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        # uvloop is not available on Windows
+        loop="uvloop" if sys.platform != "win32" else "auto",
+        http="httptools",
     )
@@ -15,19 +15,66 @@ Split into custom exception classes, core validation functions, and integration
 # imports 
 
 import os 
+import sys
 import mimetypes
-from pathlib import Path
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 #extra imports if needed
 # need to import python-magic, if implementing advanced file-type detection
 
 #Project imports
-from app.config import settings
+from app.config import get_settings, _parse_allowed_extensions
+
+@lru_cache(maxsize=32)
+def _normalize_extensions(allowed_extensions: Tuple[str, ...]) -> frozenset:
+    """Lowercase, dot-prefixed extension set, built once per distinct extension tuple"""
+    return frozenset('.' + ext.lstrip('.').lower() for ext in allowed_extensions)
+
+
+def _configured_extensions() -> frozenset:
+    """Allowed-extension set for the current settings (follows get_settings.cache_clear())"""
+    # Both lookups hit caches keyed on the settings string/its parsed tuple: no per-call copies
+    return _normalize_extensions(_parse_allowed_extensions(get_settings().allowed_extensions))
+
+# Null byte, characters invalid in filenames and path separators, checked in a single pass
+_BAD_CHARSET = frozenset('<>:"|?*\x00') | frozenset(sep for sep in (os.sep, os.altsep) if sep)
+
+# Reserved Windows device names
+_RESERVED_NAMES = frozenset({
+    'con', 'prn', 'aux', 'nul',
+    'com1', 'com2', 'com3', 'com4', 'com5', 'com6', 'com7', 'com8', 'com9',
+    'lpt1', 'lpt2', 'lpt3', 'lpt4', 'lpt5', 'lpt6', 'lpt7', 'lpt8', 'lpt9'
+})
+
+# Bytes callers need to read from an upload for type detection, e.g. await file.read(HEADER_SIZE)
+HEADER_SIZE = 16
+
+# Magic bytes (first 4 bytes of content) -> MIME type
+_MAGIC = {
+    b'%PDF': 'application/pdf',
+    b'PK\x03\x04': 'application/zip',  # Could be docx, xlsx, etc.
+    b'\xd0\xcf\x11\xe0': 'application/msword',  # OLE2 container (legacy .doc)
+    b'{\\rt': 'application/rtf',
+}
 
 #exception classes (custom)
+def _restore_error(cls, args, state):
+    """Rebuild a pickled/copied validation error without calling its __init__"""
+    error = cls.__new__(cls, *args)
+    error.args = args
+    for name, value in state.items():
+        setattr(error, name, value)
+    return error
+
 class FileValidationError(Exception):
     """Base for file validation errors"""
+    __slots__ = ('message', 'filename', 'error_code', 'status_code')
+    _CODE = sys.intern("FILE_VALIDATION_ERROR")
+
     def __init__(self, message : str, filename: str = None, error_code : str = None):
         super().__init__(message)
         self.message = message
@@ -35,6 +82,14 @@ class FileValidationError(Exception):
         self.error_code = error_code
         self.status_code = 400 #validation errors default
 
+    def __reduce__(self):
+        # BaseException.__reduce__ only carries args and __dict__, which would drop slot values
+        state = {name: getattr(self, name)
+                 for klass in type(self).__mro__
+                 for name in getattr(klass, '__slots__', ())
+                 if hasattr(self, name)}
+        return _restore_error, (type(self), self.args, state)
+
     def __str__(self) -> str:
         if self.filename:
             return f"File validation error for '{self.filename}' : {self.message}"
@@ -43,7 +98,7 @@ class FileValidationError(Exception):
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for API responses"""
         return {
-            "error" : self.error_code or "FILE_VALIDATION_ERROR",
+            "error" : self.error_code or FileValidationError._CODE,
             "message" : self.message,
             "filename" : self.filename,
             "status_code" : self.status_code
@@ -51,9 +106,12 @@ class FileValidationError(Exception):
 
 class InvalidFileExtensionError(FileValidationError):
     """Base exception for when extension not allowed"""
+    __slots__ = ('actual_extension', 'allowed_extensions')
+    _CODE = sys.intern("INVALID_FILE_EXTENSION")
+
     def __init__(self, filename: str, actual_extension: str, allowed_extensions: List[str]):
         message = f"File extension '.{actual_extension}' is not allowed. Allowed extensions: {', '.join(['.' + ext for ext in allowed_extensions])}"
-        super().__init__(message, filename, "INVALID_FILE_EXTENSION")
+        super().__init__(message, filename, self._CODE)
         self.actual_extension = actual_extension
         self.allowed_extensions = allowed_extensions
     
@@ -68,12 +126,14 @@ class InvalidFileExtensionError(FileValidationError):
 
 class FileTooLargeError(FileValidationError):
     """Raised when file exceeds maximum size"""
+    __slots__ = ('file_size', 'max_size', '_file_size_mb', '_max_size_mb')
+    _CODE = sys.intern("FILE_TOO_LARGE")
     
     def __init__(self, filename: str, file_size: int, max_size: int):
-        file_size_mb = file_size / (1024 * 1024)
-        max_size_mb = max_size / (1024 * 1024)
-        message = f"File size {file_size_mb:.2f}MB exceeds maximum allowed size {max_size_mb:.2f}MB"
-        super().__init__(message, filename, "FILE_TOO_LARGE")
+        self._file_size_mb = file_size / (1024 * 1024)
+        self._max_size_mb = max_size / (1024 * 1024)
+        message = f"File size {self._file_size_mb:.2f}MB exceeds maximum allowed size {self._max_size_mb:.2f}MB"
+        super().__init__(message, filename, self._CODE)
         self.file_size = file_size
         self.max_size = max_size
         self.status_code = 413  # Payload Too Large
@@ -83,19 +143,21 @@ class FileTooLargeError(FileValidationError):
         result.update({
             "file_size_bytes": self.file_size,
             "max_size_bytes": self.max_size,
-            "file_size_mb": self.file_size / (1024 * 1024),
-            "max_size_mb": self.max_size / (1024 * 1024)
+            "file_size_mb": self._file_size_mb,
+            "max_size_mb": self._max_size_mb
         })
         return result
 
 class UnsupportedFileTypeError(FileValidationError):
     """Raised when file type cannot be processed"""
+    __slots__ = ('detected_type', 'supported_types')
+    _CODE = sys.intern("UNSUPPORTED_FILE_TYPE")
     
     def __init__(self, filename: str, detected_type: str, supported_types: List[str] = None):
         message = f"Unsupported file type: {detected_type}"
         if supported_types:
             message += f". Supported types: {', '.join(supported_types)}"
-        super().__init__(message, filename, "UNSUPPORTED_FILE_TYPE")
+        super().__init__(message, filename, self._CODE)
         self.detected_type = detected_type
         self.supported_types = supported_types or []
         self.status_code = 415  # Unsupported Media Type
@@ -109,21 +171,20 @@ class UnsupportedFileTypeError(FileValidationError):
         return result
 
 #core validation functions
-def validate_file_extension(filename: str, allowed_extensions: List[str]) -> bool:
-    """Validate file extension against allowed list"""
+def validate_file_extension_fast(filename: str, allowed: frozenset) -> bool:
+    """Check extension against a pre-normalized set of lowercase, dot-prefixed extensions"""
+    dot = filename.rfind('.')
+    return dot > 0 and filename[dot:].lower() in allowed  # a leading dot is a dotfile, not an extension
+
+def validate_file_extension(filename: str, allowed_extensions: Optional[List[str]] = None) -> bool:
+    """Validate file extension against allowed list (defaults to configured extensions)"""
     if not filename:
         return False
     
-    # Extract extension safely using pathlib
-    extension = Path(filename).suffix.lower()
-    if not extension:
-        return False
+    if allowed_extensions is None:
+        return validate_file_extension_fast(filename, _configured_extensions())
     
-    # Normalize allowed extensions
-    allowed_set = {ext.lower() if ext.startswith('.') else f'.{ext.lower()}' 
-                   for ext in allowed_extensions}
-    
-    return extension in allowed_set
+    return validate_file_extension_fast(filename, _normalize_extensions(tuple(allowed_extensions)))
 
 def validate_file_size(file_size: int, max_size: int) -> bool:
     """Validate file size against maximum limit"""
@@ -131,82 +192,147 @@ def validate_file_size(file_size: int, max_size: int) -> bool:
         raise ValueError("File sizes cannot be negative")
     return file_size <= max_size
 
-def validate_file_type(file_content: bytes, filename: str) -> str:
-    """Detect actual file type from content and return MIME type"""
-    if not file_content:
+@lru_cache(maxsize=64)
+def _mime_for_suffixes(suffixes: str) -> Optional[str]:
+    """Guess MIME type for a suffix chain (e.g. '.tar.gz'); cached since the result is fixed per chain"""
+    return mimetypes.guess_type('x' + suffixes)[0]
+
+def validate_file_type(header: bytes, filename: str) -> str:
+    """Detect actual file type from the first bytes of content and return MIME type"""
+    if not header:
         raise ValueError("File content cannot be empty")
     
-    # Try content-based detection first
-    mime_type, _ = mimetypes.guess_type(filename)
+    # Try extension-based detection first, passing the whole suffix chain so
+    # encodings like '.tar.gz' resolve as mimetypes.guess_type(filename) does
+    # (leading dots belong to the name, as with a dotfile)
+    dot = filename.find('.', len(filename) - len(filename.lstrip('.')))
+    mime_type = _mime_for_suffixes(filename[dot:]) if dot > 0 else None
     
     # Fallback to common binary types if detection fails
     if not mime_type:
-        if file_content.startswith(b'%PDF'):
-            mime_type = 'application/pdf'
-        elif file_content.startswith(b'PK\x03\x04'):
-            mime_type = 'application/zip'  # Could be docx, xlsx, etc.
-        else:
-            mime_type = 'application/octet-stream'
+        mime_type = _MAGIC.get(bytes(header[:4]), 'application/octet-stream')
     
     return mime_type or 'application/octet-stream'
 
 
 # core integration functions
-def validate_file_comprehensive(file_content: bytes, filename: str, file_size: int) -> Dict[str, Any]:
-    """Run all validations and return detailed results"""
-    config = get_file_validation_config()
+_DETAIL_KEYS = (
+    "filename_safe", "extension_valid", "size_valid", "file_size_mb",
+    "max_size_mb", "detected_type", "type_valid",
+)
+
+def validate_file_comprehensive(header: bytes, filename: str, file_size: int,
+                                config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run all validations and return detailed results
+
+    Only the leading bytes of the upload (see HEADER_SIZE) are needed, so callers
+    never have to buffer the whole file to validate it. Pass a config from
+    get_file_validation_config() to reuse it across many files; its
+    allowed_extensions and max_upload_size are used for every check.
+    """
     errors = []
+    # Every detail key is always present; None means the check was skipped
     results = {
         "valid": True,
         "errors": errors,
-        "details": {}
+        "details": dict.fromkeys(_DETAIL_KEYS)
     }
     
-    # 1. Filename safety check
+    # Reject bad input up front so the checks below cannot raise
+    if file_size < 0:
+        results["details"]["size_valid"] = False
+        errors.append("File size cannot be negative")
+        results["valid"] = False
+        return results
+    
+    # 1. Filename safety check - nothing else is worth checking for an unsafe name
     filename_safe = is_safe_filename(filename)
     results["details"]["filename_safe"] = filename_safe
     if not filename_safe:
         errors.append("Filename contains unsafe characters or path traversal")
+        results["valid"] = False
+        return results
+    
+    if config is None:
+        config = get_file_validation_config()
     
     # 2. Extension validation
-    try:
-        extension_valid = validate_file_extension(filename, config["allowed_extensions"])
-        results["details"]["extension_valid"] = extension_valid
-        if not extension_valid:
-            errors.append(f"File extension not allowed. Allowed: {config['allowed_extensions']}")
-    except Exception as e:
-        results["details"]["extension_valid"] = False
-        errors.append(f"Extension validation failed: {str(e)}")
+    allowed = _normalize_extensions(tuple(config["allowed_extensions"]))
+    extension_valid = validate_file_extension_fast(filename, allowed)
+    results["details"]["extension_valid"] = extension_valid
+    if not extension_valid:
+        errors.append(f"File extension not allowed. Allowed: {config['allowed_extensions']}")
     
     # 3. Size validation
-    try:
-        size_valid = validate_file_size(file_size, config["max_upload_size"])
-        results["details"]["size_valid"] = size_valid
-        results["details"]["file_size_mb"] = get_file_size_mb(file_size)
-        results["details"]["max_size_mb"] = config["max_upload_size_mb"]
-        if not size_valid:
-            errors.append(f"File size {get_file_size_mb(file_size):.2f}MB exceeds maximum {config['max_upload_size_mb']:.2f}MB")
-    except Exception as e:
-        results["details"]["size_valid"] = False
-        errors.append(f"Size validation failed: {str(e)}")
+    size_valid = validate_file_size(file_size, config["max_upload_size"])
+    file_size_mb = get_file_size_mb(file_size)
+    max_size_mb = get_file_size_mb(config["max_upload_size"])
+    results["details"]["size_valid"] = size_valid
+    results["details"]["file_size_mb"] = file_size_mb
+    results["details"]["max_size_mb"] = max_size_mb
+    if not size_valid:
+        errors.append(f"File size {file_size_mb:.2f}MB exceeds maximum {max_size_mb:.2f}MB")
     
-    # 4. File type detection
-    try:
-        detected_type = validate_file_type(file_content, filename)
-        results["details"]["detected_type"] = detected_type
-        results["details"]["type_valid"] = True  # Basic validation - just detection
-    except Exception as e:
+    # 4. File type detection - skipped when the upload is already rejected,
+    # so callers may pass an empty header for oversize files
+    if extension_valid and size_valid and not header:
         results["details"]["type_valid"] = False
-        results["details"]["detected_type"] = None
-        errors.append(f"File type detection failed: {str(e)}")
+        errors.append("File content cannot be empty")
+    elif extension_valid and size_valid:
+        try:
+            detected_type = validate_file_type(header, filename)
+            results["details"]["detected_type"] = detected_type
+            results["details"]["type_valid"] = True  # Basic validation - just detection
+        except Exception as e:
+            results["details"]["type_valid"] = False
+            results["details"]["detected_type"] = None
+            errors.append(f"File type detection failed: {str(e)}")
     
     # Overall validity
     results["valid"] = len(errors) == 0
     
     return results
 
+def validate_files_batch(names: List[str], sizes: List[int], headers: List[bytes]) -> List[Dict[str, Any]]:
+    """Validate many files (e.g. bulk upload or archive members) with one config lookup"""
+    if not len(names) == len(sizes) == len(headers):
+        raise ValueError("names, sizes and headers must have the same length")
+    
+    config = get_file_validation_config()
+    return [validate_file_comprehensive(header, name, size, config)
+            for name, size, header in zip(names, sizes, headers)]
+
+def _spooled_size(file) -> int:
+    """Size of a file object via seek/tell, restoring its position"""
+    position = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(position)
+    return size
+
+async def validate_upload(file: UploadFile) -> Dict[str, Any]:
+    """Validate an uploaded file without buffering its body
+
+    The size is checked first and oversize uploads are rejected without
+    reading any content; otherwise only the first HEADER_SIZE bytes are read
+    and the file is rewound.
+    """
+    config = get_file_validation_config()
+    file_size = file.size
+    if file_size is None:
+        # Size unknown: measure the spooled file (may be on disk) off the event loop
+        file_size = await run_in_threadpool(_spooled_size, file.file)
+    
+    header = b""
+    if file_size <= config["max_upload_size"]:
+        await file.seek(0)
+        header = await file.read(HEADER_SIZE)
+        await file.seek(0)
+    
+    return validate_file_comprehensive(header, file.filename or "", file_size, config)
+
 def get_file_validation_config() -> Dict[str, Any]:
     """Get current validation configuration from settings"""
+    settings = get_settings()
     return {
         "max_upload_size": settings.max_upload_size,
         "max_upload_size_mb": get_file_size_mb(settings.max_upload_size),
@@ -226,32 +352,15 @@ def is_safe_filename(filename: str) -> bool:
     if not filename:
         return False
     
-    # Remove path components and check for traversal
-    basename = os.path.basename(filename)
-    if basename != filename:
-        return False  # Path traversal attempt
-    
-    # Check for dangerous patterns
-    dangerous_patterns = [
-        '..', '../', '..\\',  # Path traversal
-        '\x00',  # Null byte
-        '<', '>', ':', '"', '|', '?', '*',  # Invalid characters
-    ]
-    
-    filename_lower = filename.lower()
-    for pattern in dangerous_patterns:
-        if pattern in filename_lower:
-            return False
+    # Check for dangerous patterns ('..' also covers '../' and '..\\')
+    if '..' in filename:
+        return False  # Path traversal
+    if not _BAD_CHARSET.isdisjoint(filename):
+        return False  # Path components, null byte or invalid characters
     
     # Check for reserved Windows names
-    reserved_names = {
-        'con', 'prn', 'aux', 'nul',
-        'com1', 'com2', 'com3', 'com4', 'com5', 'com6', 'com7', 'com8', 'com9',
-        'lpt1', 'lpt2', 'lpt3', 'lpt4', 'lpt5', 'lpt6', 'lpt7', 'lpt8', 'lpt9'
-    }
-    
-    name_without_ext = Path(filename).stem.lower()
-    if name_without_ext in reserved_names:
+    name_without_ext = filename[:filename.rfind('.')].lower() if '.' in filename else filename.lower()
+    if name_without_ext in _RESERVED_NAMES:
         return False
     
     return True
\ No newline at end of file
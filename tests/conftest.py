@@ -0,0 +1,5 @@
+"""Shared test configuration"""
+import os
+
+# Settings requires an OpenAI key; tests never call the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,48 @@
+"""Tests for app.config"""
+import pytest
+
+from app.config import ensure_upload_dir, get_settings
+from app.utils.file_validator import validate_file_extension
+
+
+@pytest.fixture
+def reload_settings(monkeypatch):
+    """Clear the settings cache before and after a test that changes env vars"""
+    get_settings.cache_clear()
+    yield monkeypatch
+    get_settings.cache_clear()
+
+
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings()
+
+
+def test_cache_clear_reloads_allowed_extensions(reload_settings):
+    assert validate_file_extension("a.pdf")
+    
+    reload_settings.setenv("ALLOWED_EXTENSIONS", "txt")
+    get_settings.cache_clear()
+    
+    assert not validate_file_extension("a.pdf")
+    assert validate_file_extension("a.txt")
+
+
+def test_ensure_upload_dir_creates_nested_dirs(reload_settings, tmp_path):
+    upload_dir = tmp_path / "a" / "uploads"
+    reload_settings.setenv("UPLOAD_DIR", str(upload_dir))
+    get_settings.cache_clear()
+    
+    ensure_upload_dir()
+    ensure_upload_dir()  # already exists
+    
+    assert upload_dir.is_dir()
+
+
+def test_ensure_upload_dir_rejects_existing_file(reload_settings, tmp_path):
+    upload_file = tmp_path / "uploads"
+    upload_file.write_text("")
+    reload_settings.setenv("UPLOAD_DIR", str(upload_file))
+    get_settings.cache_clear()
+    
+    with pytest.raises(FileExistsError):
+        ensure_upload_dir()
@@ -0,0 +1,342 @@
+"""Tests for app.utils.file_validator"""
+import copy
+import io
+import mimetypes
+import pickle
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils.file_validator import (
+    FileTooLargeError,
+    FileValidationError,
+    InvalidFileExtensionError,
+    UnsupportedFileTypeError,
+    is_safe_filename,
+    get_file_validation_config,
+    validate_file_comprehensive,
+    validate_file_extension,
+    validate_file_type,
+    validate_files_batch,
+    validate_upload,
+)
+
+PDF_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+DETAIL_KEYS = {
+    "filename_safe", "extension_valid", "size_valid", "file_size_mb",
+    "max_size_mb", "detected_type", "type_valid",
+}
+
+
+ERRORS = [
+    FileValidationError("Bad file", "a.pdf", "CUSTOM_CODE"),
+    InvalidFileExtensionError("a.exe", "exe", ["pdf", "txt"]),
+    FileTooLargeError("a.pdf", 3 * 1024 * 1024, 1024 * 1024),
+    UnsupportedFileTypeError("a.bin", "application/octet-stream", ["application/pdf"]),
+]
+
+
+def test_file_validation_error_to_dict():
+    assert FileValidationError("Bad file", "a.pdf", "CUSTOM_CODE").to_dict() == {
+        "error": "CUSTOM_CODE",
+        "message": "Bad file",
+        "filename": "a.pdf",
+        "status_code": 400,
+    }
+    assert FileValidationError("Bad file").to_dict()["error"] == "FILE_VALIDATION_ERROR"
+
+
+def test_invalid_file_extension_error_to_dict():
+    result = InvalidFileExtensionError("a.exe", "exe", ["pdf", "txt"]).to_dict()
+    
+    assert result == {
+        "error": "INVALID_FILE_EXTENSION",
+        "message": "File extension '.exe' is not allowed. Allowed extensions: .pdf, .txt",
+        "filename": "a.exe",
+        "status_code": 400,
+        "actual_extension": "exe",
+        "allowed_extensions": ["pdf", "txt"],
+    }
+
+
+def test_file_too_large_error_to_dict():
+    result = FileTooLargeError("a.pdf", 3 * 1024 * 1024 + 512 * 1024, 1024 * 1024).to_dict()
+    
+    assert result == {
+        "error": "FILE_TOO_LARGE",
+        "message": "File size 3.50MB exceeds maximum allowed size 1.00MB",
+        "filename": "a.pdf",
+        "status_code": 413,
+        "file_size_bytes": 3 * 1024 * 1024 + 512 * 1024,
+        "max_size_bytes": 1024 * 1024,
+        "file_size_mb": 3.5,
+        "max_size_mb": 1.0,
+    }
+
+
+def test_unsupported_file_type_error_to_dict():
+    result = UnsupportedFileTypeError("a.bin", "application/octet-stream", ["application/pdf"]).to_dict()
+    
+    assert result == {
+        "error": "UNSUPPORTED_FILE_TYPE",
+        "message": "Unsupported file type: application/octet-stream. Supported types: application/pdf",
+        "filename": "a.bin",
+        "status_code": 415,
+        "detected_type": "application/octet-stream",
+        "supported_types": ["application/pdf"],
+    }
+    assert UnsupportedFileTypeError("a.bin", "x/y").to_dict()["supported_types"] == []
+
+
+
+@pytest.mark.parametrize("error", ERRORS, ids=lambda error: type(error).__name__)
+@pytest.mark.parametrize("clone", [copy.copy, copy.deepcopy, lambda e: pickle.loads(pickle.dumps(e))],
+                         ids=["copy", "deepcopy", "pickle"])
+def test_validation_error_round_trip_keeps_state(error, clone):
+    cloned = clone(error)
+    
+    assert type(cloned) is type(error)
+    assert cloned.args == error.args
+    assert str(cloned) == str(error)
+    assert cloned.to_dict() == error.to_dict()
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("report.pdf", True),
+    ("REPORT.PDF", True),
+    ("archive.tar.docx", True),
+    ("report.exe", False),
+    ("report", False),
+    ("report.", False),
+    (".pdf", False),  # dotfile, no extension
+    ("", False),
+])
+def test_validate_file_extension_default(filename, expected):
+    assert validate_file_extension(filename) is expected
+
+
+def test_validate_file_extension_explicit_list():
+    assert validate_file_extension("a.TXT", ["txt"])
+    assert validate_file_extension("a.txt", [".TXT"])
+    assert not validate_file_extension("a.pdf", ["txt"])
+    assert not validate_file_extension(".txt", ["txt"])
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("report.pdf", True),
+    ("report.v2.docx", True),
+    ("../report.pdf", False),
+    ("dir/report.pdf", False),
+    ("x..y.pdf", False),
+    ("a?.pdf", False),
+    ("a\x00.pdf", False),
+    ("con.txt", False),
+    ("COM1.pdf", False),
+    ("con.", False),  # Windows strips trailing dots, so this is still CON
+    ("con", False),
+    (".con", True),
+    ("console.txt", True),
+    ("", False),
+])
+def test_is_safe_filename(filename, expected):
+    assert is_safe_filename(filename) is expected
+
+
+def test_validate_file_type_dotfile_uses_magic_bytes():
+    assert validate_file_type(b"PK\x03\x04rest", ".pdf") == "application/zip"
+
+
+@pytest.mark.parametrize("header, expected", [
+    (b"%PDF-1.7", "application/pdf"),
+    (b"PK\x03\x04\x14\x00", "application/zip"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/msword"),
+    (b"{\\rtf1\\ansi", "application/rtf"),
+    (b"MZ\x90\x00", "application/octet-stream"),
+    (b"%PD", "application/octet-stream"),  # shorter than a magic prefix
+])
+def test_validate_file_type_magic_bytes(header, expected):
+    assert validate_file_type(header, "noext") == expected
+
+
+@pytest.mark.parametrize("filename", [
+    "report.pdf", "REPORT.PDF", "report.v2.docx", "x.tar.gz", "x.tar.Z",
+    "notes.txt.bz2", ".x.tar.gz", "a.b/report.pdf", "noext", "..pdf",
+])
+def test_validate_file_type_matches_mimetypes(filename):
+    expected = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    assert validate_file_type(b"abcd", filename) == expected
+
+
+def test_validate_file_type_keeps_encoding_suffixes():
+    assert validate_file_type(b"abcd", "x.tar.gz") == "application/x-tar"
+
+
+def test_comprehensive_valid_file():
+    result = validate_file_comprehensive(PDF_HEADER, "report.pdf", 1024)
+    
+    assert result["valid"]
+    assert result["errors"] == []
+    assert result["details"]["detected_type"] == "application/pdf"
+    assert result["details"]["type_valid"] is True
+
+
+def test_comprehensive_unsafe_filename_returns_early():
+    result = validate_file_comprehensive(PDF_HEADER, "../report.pdf", 1024)
+    details = result["details"]
+    
+    assert not result["valid"]
+    assert set(details) == DETAIL_KEYS
+    assert details["filename_safe"] is False
+    assert all(details[key] is None for key in DETAIL_KEYS - {"filename_safe"})
+
+
+def test_comprehensive_skips_type_detection_on_bad_extension():
+    result = validate_file_comprehensive(PDF_HEADER, "report.exe", 1024)
+    details = result["details"]
+    
+    assert not result["valid"]
+    assert set(details) == DETAIL_KEYS
+    assert details["extension_valid"] is False
+    assert details["size_valid"] is True
+    assert details["detected_type"] is None
+    assert details["type_valid"] is None
+
+
+def test_comprehensive_skips_type_detection_when_too_large():
+    result = validate_file_comprehensive(PDF_HEADER, "report.pdf", 200 * 1024 * 1024)
+    details = result["details"]
+    
+    assert not result["valid"]
+    assert details["size_valid"] is False
+    assert details["file_size_mb"] == 200
+    assert details["type_valid"] is None
+    assert any("exceeds maximum" in error for error in result["errors"])
+
+
+def test_comprehensive_negative_size_returns_early():
+    result = validate_file_comprehensive(PDF_HEADER, "report.pdf", -1)
+    details = result["details"]
+    
+    assert not result["valid"]
+    assert result["errors"] == ["File size cannot be negative"]
+    assert set(details) == DETAIL_KEYS
+    assert details["size_valid"] is False
+    assert details["filename_safe"] is None
+
+
+def test_comprehensive_empty_header_fails_type_check():
+    result = validate_file_comprehensive(b"", "report.pdf", 0)
+    details = result["details"]
+    
+    assert not result["valid"]
+    assert result["errors"] == ["File content cannot be empty"]
+    assert set(details) == DETAIL_KEYS
+    assert details["extension_valid"] is True
+    assert details["type_valid"] is False
+    assert details["detected_type"] is None
+
+
+class CountingBytesIO(io.BytesIO):
+    """BytesIO that records how many bytes were read"""
+    
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.mark.asyncio
+async def test_validate_upload_reads_only_header():
+    body = CountingBytesIO(PDF_HEADER + b"x" * 4096)
+    upload = UploadFile(body, filename="report.pdf", size=len(body.getvalue()))
+    
+    result = await validate_upload(upload)
+    
+    assert result["valid"]
+    assert result["details"]["detected_type"] == "application/pdf"
+    assert body.bytes_read <= 16
+    assert body.tell() == 0
+
+
+@pytest.mark.asyncio
+async def test_validate_upload_measures_size_when_unknown():
+    body = CountingBytesIO(PDF_HEADER + b"x" * 4096)
+    upload = UploadFile(body, filename="report.pdf")
+    
+    result = await validate_upload(upload)
+    
+    assert result["valid"]
+    assert result["details"]["file_size_mb"] == len(body.getvalue()) / (1024 * 1024)
+    assert body.tell() == 0
+
+
+@pytest.mark.asyncio
+async def test_validate_upload_rejects_oversize_without_reading():
+    body = CountingBytesIO(PDF_HEADER)
+    upload = UploadFile(body, filename="report.pdf", size=200 * 1024 * 1024)
+    
+    result = await validate_upload(upload)
+    
+    assert not result["valid"]
+    assert result["details"]["size_valid"] is False
+    assert result["details"]["type_valid"] is None
+    assert body.bytes_read == 0
+
+
+@pytest.mark.asyncio
+async def test_validate_upload_without_filename():
+    upload = UploadFile(io.BytesIO(PDF_HEADER), size=len(PDF_HEADER))
+    
+    result = await validate_upload(upload)
+    
+    assert not result["valid"]
+    assert result["details"]["filename_safe"] is False
+
+
+def test_comprehensive_uses_extensions_from_given_config():
+    config = {**get_file_validation_config(), "allowed_extensions": ["txt"]}
+    
+    rejected = validate_file_comprehensive(PDF_HEADER, "report.pdf", 1024, config)
+    accepted = validate_file_comprehensive(b"hello", "notes.txt", 5, config)
+    
+    assert not rejected["valid"]
+    assert rejected["details"]["extension_valid"] is False
+    assert rejected["errors"] == ["File extension not allowed. Allowed: ['txt']"]
+    assert accepted["valid"]
+
+
+def test_comprehensive_uses_size_limit_from_given_config():
+    config = {**get_file_validation_config(), "max_upload_size": 1024}
+    
+    result = validate_file_comprehensive(PDF_HEADER, "report.pdf", 2048, config)
+    
+    assert not result["valid"]
+    assert result["details"]["max_size_mb"] == 1024 / (1024 * 1024)
+    assert result["errors"] == ["File size 0.00MB exceeds maximum 0.00MB"]
+
+
+def test_validate_files_batch():
+    results = validate_files_batch(
+        ["report.pdf", "../evil.pdf", "tool.exe", "big.pdf"],
+        [1024, 1024, 1024, 200 * 1024 * 1024],
+        [PDF_HEADER, PDF_HEADER, b"MZ\x90\x00", PDF_HEADER],
+    )
+    
+    assert [result["valid"] for result in results] == [True, False, False, False]
+    assert results[0]["details"]["detected_type"] == "application/pdf"
+    assert results[1]["details"]["filename_safe"] is False
+    assert results[2]["details"]["extension_valid"] is False
+    assert results[3]["details"]["size_valid"] is False
+
+
+def test_validate_files_batch_empty():
+    assert validate_files_batch([], [], []) == []
+
+
+def test_validate_files_batch_length_mismatch():
+    with pytest.raises(ValueError):
+        validate_files_batch(["report.pdf"], [1024, 2048], [PDF_HEADER])
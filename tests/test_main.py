@@ -0,0 +1,60 @@
+"""Tests for app.main"""
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_cors_preflight(client):
+    response = client.options("/health", headers={
+        "Origin": "https://example.com",
+        "Access-Control-Request-Method": "GET",
+    })
+    
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "https://example.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+
+
+def test_cors_simple_request_echoes_origin_with_credentials(client):
+    response = client.get("/health", headers={"Origin": "https://example.com", "Cookie": "session=1"})
+    
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "https://example.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+
+
+def test_options_without_preflight_is_not_short_circuited(client):
+    assert client.options("/nonexistent").status_code == 404
+    assert client.options("/health").status_code == 405
+
+
+def test_root(client):
+    response = client.get("/")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["status"] == "operational"
+
+
+def test_health(client):
+    response = client.get("/health")
+    
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "environment": get_settings().app_env}
+    assert response.content == orjson.dumps(response.json())  # same formatting as ORJSONResponse
+
+
+def test_static_routes_documented_as_json(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    
+    for path in ("/", "/health"):
+        content = paths[path]["get"]["responses"]["200"]["content"]
+        assert "example" in content["application/json"]